@@ -7,8 +7,9 @@ __author__ = "Jan Seifert <sam4k@logogistiks.de>"
 #built in modules
 import os
 import re
-from copy import deepcopy
 from datetime import datetime
+from functools import reduce
+from operator import xor
 from math import trunc
 from time import sleep
 from dataclasses import dataclass
@@ -18,6 +19,7 @@ try:
     import openpyxl
     import openpyxl.cell
     import openpyxl.styles
+    from openpyxl.utils import get_column_letter
     from openpyxl.worksheet.worksheet import Worksheet
     from serial import EIGHTBITS, PARITY_NONE, STOPBITS_ONE, Serial
     from serial.tools import list_ports
@@ -58,7 +60,7 @@ MODES = [
 
 #################### Begin Program Logic #####################
 
-COM_CODES = [
+COM_CODES = (
     CODE_STX := b"\x02",
     CODE_ENQ := b"\x05",
     CODE_ACK := b"\x06",
@@ -68,10 +70,32 @@ COM_CODES = [
     CODE_EXIT := b"\xB0",
     CODE_BAR := b"\xB1",
     CODE_NOBAR := b"\xB2"
-]
+)
 """Codes for communication with the SAM4000 device"""
 
-@dataclass
+TARGET_TYPES = frozenset(("LG", "LP", "KK", "ZS", "LS"))
+"""Target types known to the SAM4000 device"""
+
+RE_HEADER = re.compile(
+    r"(?:(?P<bc>[0-9]{8})|[^\r]*)\r"     # barcode
+    r"(?:(?P<mc>[0-9]{8})|[^\r]*)\r"     # manual code
+    r"(?:(?P<tt>LG|LP|KK|ZS|LS)|[^\r]*)\r" # target type
+    r"(?:(?P<tn>[0-9]{2})|[^\r]*)\r"     # target number
+    r"(?:(?P<div>[0-9]\.[0-9])|[^\r]*)\r" # division factor
+    r"(?:(?P<sn>[0-9]{2})|[^\r]*)\r")    # shot number
+"""Precompiled pattern matching all six header fields of a transmission in one pass. \\
+A group only captures when its field is fully valid, otherwise the group stays None and the fallback swallows the field (e.g. when it contains "?")."""
+
+SIDE_THIN = openpyxl.styles.Side(style="thin")
+"""Shared thin border side, openpyxl style objects are immutable and can be reused freely"""
+
+_BORDERS: dict[tuple[bool, bool, bool, bool], openpyxl.styles.Border] = {}
+"""Cache of Border objects keyed by the (left, right, top, bottom) flags of `set_cell`"""
+
+_ALIGNMENTS: dict[tuple[bool, bool], openpyxl.styles.Alignment] = {}
+"""Cache of Alignment objects keyed by the (center_h, center_v) flags of `set_cell`"""
+
+@dataclass(frozen=True, slots=True)
 class Shot:
     """Represents a shot in the transmission"""
     ring: float | None = None
@@ -83,6 +107,9 @@ class Shot:
         """Returns a human readable representation of the Shot object"""
         return f"Shot(ring={self.ring}, div={self.div}, x={self.x}, y={self.y})"
 
+SHOT_EMPTY = Shot(0.0, None, None, None)
+"""Shared padding shot used to fill up short strips. Shots are never mutated after creation, so one instance can be referenced many times."""
+
 class Transmission:
     "This class implements handling of a typical transmission by the SAM4000 device, which is received in bytes via serial connection."
 
@@ -118,50 +145,51 @@ class Transmission:
 
     def __str__(self) -> str:
         """Returns a human readable representation of the Transmission object"""
-        res = ""
-        res += f"Transmission(\n"
-        res += f"    barcode={self.barcode},\n"
-        res += f"    manual_code={self.manual_code},\n"
-        res += f"    target_type={'None' if self.target_type is None else f'{self.target_type}'},\n"
-        res += f"    target_num={self.target_num},\n"
-        res += f"    div={self.div},\n"
-        res += f"    shots_num={self.shots_num},\n"
-        res += f"    shots=[\n"
-        for i, shot in enumerate(self.shots):
-            res += f"        {shot}{',' if i != len(self.shots)-1 else ''}\n"
-        res += f"    ]\n"
-        res += f")"
-        return res
+        lines = [
+            f"Transmission(",
+            f"    barcode={self.barcode},",
+            f"    manual_code={self.manual_code},",
+            f"    target_type={'None' if self.target_type is None else f'{self.target_type}'},",
+            f"    target_num={self.target_num},",
+            f"    div={self.div},",
+            f"    shots_num={self.shots_num},",
+            f"    shots=["
+        ]
+        if self.shots:
+            lines.append(",\n".join(f"        {shot}" for shot in self.shots))
+        lines.append(f"    ]")
+        lines.append(f")")
+        return "\n".join(lines)
 
     @staticmethod
     def _valid_barcode(bc: str) -> bool:
         """Checks if a barcode string is of valid form"""
-        return bool(re.fullmatch(r"[0-9]{8}", bc))
+        return len(bc) == 8 and bc.isdecimal()
 
     @staticmethod
     def _valid_manual_code(mc: str) -> bool:
         """Checks if a manual code string is of valid form"""
-        return bool(re.fullmatch(r"[0-9]{8}", mc))
+        return len(mc) == 8 and mc.isdecimal()
 
     @staticmethod
     def _valid_target_type(tt: str) -> bool:
         """Checks if a target type string is of valid form"""
-        return tt in ("LG", "LP", "KK", "ZS", "LS")
+        return tt in TARGET_TYPES
 
     @staticmethod
     def _valid_target_num(tn: str) -> bool:
         """Checks if a target number string is of valid form"""
-        return bool(re.fullmatch(r"[0-9]{2}", tn))
+        return len(tn) == 2 and tn.isdecimal()
 
     @staticmethod
     def _valid_div(div: str) -> bool:
         """Checks if a division factor string is of valid form"""
-        return bool(re.fullmatch(r"[0-9]\.[0-9]", div))
+        return len(div) == 3 and div[0].isdecimal() and div[1] == "." and div[2].isdecimal()
 
     @staticmethod
     def _valid_shot_number(sn: str) -> bool:
         """Checks if a shot number string is of valid form"""
-        return bool(re.fullmatch(r"[0-9]{2}", sn))
+        return len(sn) == 2 and sn.isdecimal()
 
     @staticmethod
     def from_bytes(byt: bytes, log: bool=False) -> Transmission:
@@ -169,47 +197,65 @@ class Transmission:
         if log:
             print(byt)
         trans = Transmission.create_empty()
-        bc, mc, tt, tn, div, sn, *s = [part.decode("unicode-escape") for part in byt.split(CODE_CR)] # remove last empty string
-        s = [item for item in s if item] # remove empty strings
+        txt = byt.decode("ascii", errors="replace") # payload is plain ascii, decode it in one go
+        head = RE_HEADER.match(txt) # validates and extracts all six header fields in one pass
+        if head is None:
+            raise ValueError("bytes are of invalid form, header fields are missing")
+        tail = txt[head.end():].rstrip("\r") # stripping the trailing CR avoids a filter pass for the empty last part
+        s = tail.split("\r") if tail else []
         if log:
-            for item in [bc, mc, tt, tn, div, sn, s]:
+            for item in [*head.groups(), s]:
                 print(item)
         if len(s) % 4 != 0: # s is a list of strings, each 4 strings represent a shot
             raise ValueError("bytes are of invalid form, shot data does not make sense (not a multiple of 4)")
-        # technically the ? check is not necessary, but is left for clarity
-        if not "?" in bc and Transmission._valid_barcode(bc):
-            trans.barcode = bc
-        if not "?" in mc and Transmission._valid_manual_code(mc):
-            trans.manual_code = mc
-        if not "?" in tt and Transmission._valid_target_type(tt):
-            trans.target_type = tt
-        if not "?" in tn and Transmission._valid_target_num(tn):
-            trans.target_num = int(tn)
-        if not "?" in div and Transmission._valid_div(div):
-            trans.div = float(div)
-        if not "?" in sn and Transmission._valid_shot_number(sn):
-            trans.shots_num = int(sn)
-        trans.shots = []
-        for i in range(0, len(s), 4):
-            trans.shots.append(Shot(
-                ring=float(s[i]) if not "?" in s[i] else None,
-                div=float(s[i+1]) if not "?" in s[i+1] else None,
-                x=int(s[i+2]) if not "?" in s[i+2] else None,
-                y=int(s[i+3]) if not "?" in s[i+3] else None
-            ))
+        # a group is None when its field was invalid or contained "?", the respective attribute then keeps its default
+        if head["bc"] is not None:
+            trans.barcode = head["bc"]
+        if head["mc"] is not None:
+            trans.manual_code = head["mc"]
+        if head["tt"] is not None:
+            trans.target_type = head["tt"]
+        if head["tn"] is not None:
+            trans.target_num = int(head["tn"])
+        if head["div"] is not None:
+            trans.div = float(head["div"])
+        if head["sn"] is not None:
+            trans.shots_num = int(head["sn"])
+        it = iter(s) # zipping the same iterator four times yields the parts in groups of 4
+        trans.shots = [Shot(
+            ring=float(r) if not r.startswith("?") else None, # missing values keep their field width and are all "?", so checking the first char suffices
+            div=float(d) if not d.startswith("?") else None,
+            x=int(x) if not x.startswith("?") else None,
+            y=int(y) if not y.startswith("?") else None
+        ) for r, d, x, y in zip(it, it, it, it)]
         #*Note: ↓ maybe useful later for distinguishing between cases: ↓
         #   ring is 0 and div is ? => missed shot
         #   ring > 0 und div is ? => manually corrected shot
         #   rind > 0 und Div > 0 => normal shot
         return trans
 
+    @staticmethod
+    def _read_frame(ser: Serial) -> bytes:
+        """Reads bytes from the serial port until the end-byte "$" is reached (exclusively). \\
+        Unlike `Serial.read_until`, which fetches one byte per syscall, this drains the receive buffer in chunks."""
+        buf = bytearray()
+        while True:
+            chunk = ser.read(max(1, ser.in_waiting)) # blocks (up to timeout) only when the buffer is empty
+            if not chunk: # timeout => return what arrived so far, like read_until would
+                return bytes(buf)
+            end = chunk.find(b"\x24")
+            if end != -1:
+                buf += chunk[:end]
+                return bytes(buf)
+            buf += chunk
+
     @staticmethod
     def from_serial(ser: Serial, retry_infinite: bool=False) -> Transmission | None:
         """Receives bytes from the given serial port and returns it as a Transmission object. \\
         If checksum is wrong and max retries is reached, sends CODE_ACK and returns None."""
         retries = 0
         while True:
-            response = ser.read_until(b"\x24")[:-1] # read until dollar sign exclusively
+            response = Transmission._read_frame(ser) # read until dollar sign exclusively
             if LOG_TRANSMISSIONS:
                 log(response)
             data, checksum = response.split(CODE_ETB)
@@ -226,24 +272,39 @@ class Transmission:
                 break
         return Transmission.from_bytes(data)
 
+    def _count_shots(self) -> tuple[int, int, int]:
+        """Counts (valid, invalid, manually corrected) shots in a single pass over the shot list"""
+        valid = invalid = corrected = 0
+        for shot in self.shots:
+            if shot.ring is None:
+                invalid += 1
+            else:
+                valid += 1
+                if shot.div is None:
+                    corrected += 1
+        return valid, invalid, corrected
+
     def get_valid_shot_num(self) -> int:
         """Returns the number of valid shots in the transmission"""
-        return sum(1 for shot in self.shots if shot.ring is not None)
+        return self._count_shots()[0]
 
     def get_invalid_shot_num(self) -> int:
         """Returns the number of invalid shots in the transmission"""
-        return sum(1 for shot in self.shots if shot.ring is None)
+        return self._count_shots()[1]
 
     def get_manual_corrected_num(self) -> int:
         """Returns the number of shots that were manually corrected"""
-        return sum(1 for shot in self.shots if shot.ring is not None and shot.div is None)
+        return self._count_shots()[2]
 
     def get_valid_shots(self, fill: int=None) -> list[Shot]:
         """Returns a list of valid shots in the transmission. \\
-        If `fill` is given, pads the list with empty shots to the given length."""
+        If `fill` is given, pads the list with empty shots or truncates it to exactly the given length."""
         valid_shots = [shot for shot in self.shots if shot.ring is not None]
-        if fill is not None and len(valid_shots) < fill:
-            valid_shots += [Shot(0.0, None, None, None) for _ in range(fill - len(valid_shots))]
+        if fill is not None:
+            if len(valid_shots) < fill:
+                valid_shots += [SHOT_EMPTY] * (fill - len(valid_shots))
+            else:
+                del valid_shots[fill:] # discard surplus in place, saves the caller a slice copy
         return valid_shots
 
 class MemoryHandler:
@@ -271,12 +332,12 @@ class MemoryHandler:
 
         # update short term memory with the current transmission
         # fill with empty shots if less than expected, discard surplus if more than expected
-        self.MEM_short += trans.get_valid_shots(fill=self.SHOTS_PER_STRIP)[:self.SHOTS_PER_STRIP] # looks hacky, but works. Tested all cases > < ==
+        self.MEM_short += trans.get_valid_shots(fill=self.SHOTS_PER_STRIP) # fill pads and truncates to exactly SHOTS_PER_STRIP
         self.strip_count += 1 # strip processed
 
         # check if short term can be carried over to long term
         if len(self.MEM_short) >= SHOTS_PER_SERIES:
-            self.MEM_long[self.current_person].append(deepcopy(self.MEM_short[:SHOTS_PER_SERIES])) # discard surplus, shouldnt happen though
+            self.MEM_long[self.current_person].append(self.MEM_short[:SHOTS_PER_SERIES]) # discard surplus, shouldnt happen though
             self.MEM_short.clear() # clear short-term memory for next strip
 
     def finalize(self) -> None:
@@ -285,16 +346,61 @@ class MemoryHandler:
         # remove empty people, can happen if pressed `n` immediately after entering a name
         self.MEM_long = {k: v for k, v in self.MEM_long.items() if v}
 
+class KeypressRecorder:
+    """Collects keypresses in the background through a single persistent listener. \\
+    Starting and stopping a fresh listener for every poll cycle installs and removes an OS keyboard hook each time, this keeps one hook alive instead."""
+    def __init__(self) -> None:
+        """Initializes an inactive recorder, call `start` to begin recording."""
+        self._pressed: list[keyboard.Key | keyboard.KeyCode] = []
+        self._listener: keyboard.Listener = None
+
+    def start(self) -> None:
+        """Starts the background listener. From here on keypresses are suppressed and collected until `stop` is called. \\
+        Careful: while recording, other keyboard input (e.g. beaupy prompts) does not work."""
+        self._pressed = []
+        self._listener = keyboard.Listener(on_press=None, on_release=lambda key: self._pressed.append(key), suppress=True) # still looks a bit cursed
+        self._listener.start()
+
+    def stop(self) -> None:
+        """Stops the background listener and discards any unread keypresses."""
+        if self._listener is not None:
+            self._listener.stop()
+            self._listener = None
+        self._pressed = []
+
+    def drain(self) -> list[keyboard.Key | keyboard.KeyCode]:
+        """Returns all keypresses recorded since the last call and empties the buffer."""
+        keys, self._pressed = self._pressed, [] # swap instead of copy+clear, so the listener thread never appends to a list we already read
+        return keys
+
+    def wait(self, t: float) -> list[keyboard.Key | keyboard.KeyCode]:
+        """Waits up to `t` seconds, returning early once a keypress arrives, then drains the buffer. \\
+        After the first key a small residual window is waited out, so combinations (e.g. Esc and n together) end up in the same result."""
+        remaining = t
+        while remaining > 0 and not self._pressed:
+            sleep(min(0.05, remaining)) # poll in small steps, the listener thread fills the buffer in the background
+            remaining -= 0.05
+        if self._pressed:
+            sleep(0.05) # residual window for the second key of a combination
+        return self.drain()
+
+_LOG_FILE = None
+"""Handle of the session logfile, opened lazily on the first `log` call"""
+
 def log(content: str | bytes) -> None:
-    """Logs the given content (readableBuffer) to a file in the log directory, filename is current time"""
-    if not os.path.exists("log"):
-        os.mkdir("log")
-    with open(os.path.join("log", f"log-{nowtime()}.bin"), "wb" if isinstance(content, bytes) else "w") as f:
-        f.write(content)
+    """Logs the given content (readableBuffer) to the session logfile in the log directory, one entry per line. \\
+    The file is opened on first use (filename is the session start time) and kept open, so logging costs one write instead of an open/write/close per transmission."""
+    global _LOG_FILE
+    if _LOG_FILE is None:
+        os.makedirs("log", exist_ok=True)
+        _LOG_FILE = open(os.path.join("log", f"log-{nowtime()}.bin"), "ab")
+    _LOG_FILE.write(content if isinstance(content, bytes) else content.encode("utf-8"))
+    _LOG_FILE.write(b"\n")
+    _LOG_FILE.flush() # the log exists to survive crashes, so push every entry to disk
 
 def clear() -> None:
     """Clears the console"""
-    os.system(("cls" if os.name == "nt" else "clear"))
+    print("\x1b[2J\x1b[H", end="", flush=True) # ANSI escape, works on windows too since colorama is initialized
 
 def nowtime(pretty: bool=False) -> str:
     """Returns the current time in YYYY_MM_DD-HH_MM_SS format. \\
@@ -306,19 +412,7 @@ def nowtime(pretty: bool=False) -> str:
 def checksum_xor(byt: bytes) -> int:
     """Calculates the XOR checksum of the given bytes. \\
     Works by XORing all the bytes together."""
-    chsum = 0
-    for b in byt:
-        chsum ^= b
-    return chsum
-
-def record_keypresses(t: float=1) -> list[keyboard.Key | keyboard.KeyCode]:
-    """Records all keyboard activity in the next `t` seconds synchronously, blocking the program flow."""
-    pressed = []
-    listener = keyboard.Listener(on_press=None, on_release=pressed.append, suppress=True) # looks a bit cursed
-    listener.start()
-    sleep(t)
-    listener.stop()
-    return pressed
+    return reduce(xor, byt, 0) # iterates in C instead of a python-level byte loop
 
 def open_file(fname: str) -> None:
     """Opens the file with the default program"""
@@ -339,22 +433,26 @@ def set_cell(ws, row: int, col: int, value=None, fill=None, b_left: bool=False,
         cell.value = value
     if fill is not None:
         cell.fill = fill
-    if any((b_left, b_right, b_top, b_bottom)):
-        cell.border = openpyxl.styles.Border(
-            left=openpyxl.styles.Side(style="thin") if b_left else None,
-            right=openpyxl.styles.Side(style="thin") if b_right else None,
-            top=openpyxl.styles.Side(style="thin") if b_top else None,
-            bottom=openpyxl.styles.Side(style="thin") if b_bottom else None)
-    if any((center_h, center_v)):
-        cell.alignment = openpyxl.styles.Alignment(horizontal="center" if center_h else None, vertical="center" if center_v else None)
+    if b_left or b_right or b_top or b_bottom: # plain or-chain short-circuits without building a tuple
+        key = (b_left, b_right, b_top, b_bottom)
+        if key not in _BORDERS: # build each needed combination only once, cells share the instance
+            _BORDERS[key] = openpyxl.styles.Border(
+                left=SIDE_THIN if b_left else None,
+                right=SIDE_THIN if b_right else None,
+                top=SIDE_THIN if b_top else None,
+                bottom=SIDE_THIN if b_bottom else None)
+        cell.border = _BORDERS[key]
+    if center_h or center_v:
+        key = (center_h, center_v)
+        if key not in _ALIGNMENTS:
+            _ALIGNMENTS[key] = openpyxl.styles.Alignment(horizontal="center" if center_h else None, vertical="center" if center_v else None)
+        cell.alignment = _ALIGNMENTS[key]
 
 def draw_header(ws, mode: int, start_cell: tuple[int]=(1, 1)) -> tuple[int]:
     """Draws the header on the excel worksheet. Returns the bottom right cell of the header. \\
     `start_cell` [row, col] is the top left cell of this header, Excel cells are 1-indexed."""
 
     shift_row, shift_col = start_cell[0] - 1, start_cell[1] - 1
-    if shift_col >= 26 - 3 - SHOTS_PER_SERIES: # 3 for wireframe
-        raise ValueError("shift_col must be less than 26, otherwise the column names will not fit in Excel")
 
     # date and time
     set_cell(ws, shift_row + 2, shift_col + 2, nowtime(pretty=True), PATTERN_HEADER, b_left=True, b_right=True, b_top=True, b_bottom=True)
@@ -382,8 +480,11 @@ def draw_wireframe(ws, shot_data: list[list[Shot]], mode: int, start_cell: tuple
     `start_cell` [row, col] is the top left cell of this wireframe, Excel cells are 1-indexed."""
 
     shift_row, shift_col = start_cell[0] - 1, start_cell[1] - 1
-    if shift_col >= 26 - 3 - SHOTS_PER_SERIES: # 3 for wireframe
-        raise ValueError("shift_col must be less than 26, otherwise the column names will not fit in Excel")
+
+    # column letters are loop-invariant, compute them once ("C" is column index 3)
+    col_first = get_column_letter(3 + shift_col)
+    col_last = get_column_letter(2 + shift_col + SHOTS_PER_SERIES)
+    col_total = get_column_letter(3 + shift_col + SHOTS_PER_SERIES)
 
     # table head, top left
     set_cell(ws, shift_row + 2, shift_col + 2, "Schuss", PATTERN_HEADER, b_left=True, b_right=True, b_top=True, b_bottom=True)
@@ -393,7 +494,7 @@ def draw_wireframe(ws, shot_data: list[list[Shot]], mode: int, start_cell: tuple
         set_cell(ws, shift_row + 3 + i, shift_col + 2, "Ringwert", PATTERN_HEADER, b_left=True, b_right=True)
 
         # result column, right
-        shot_range = f"{chr(ord('C') + shift_col)}{shift_row + 3 + i}:{chr(ord('C') + shift_col + SHOTS_PER_SERIES - 1)}{shift_row + 3 + i}" # one series
+        shot_range = f"{col_first}{shift_row + 3 + i}:{col_last}{shift_row + 3 + i}" # one series
         if mode == 3:
             formula_sum_series = f"=SUMPRODUCT(TRUNC({shot_range}))"
         else:
@@ -401,7 +502,7 @@ def draw_wireframe(ws, shot_data: list[list[Shot]], mode: int, start_cell: tuple
         set_cell(ws, shift_row + 3 + i, shift_col + 3 + SHOTS_PER_SERIES, formula_sum_series, b_left=True, b_right=True) # total sum of series
 
     # final result, bottom right
-    formula_sum_all = f"=SUM({chr(ord('C') + shift_col + SHOTS_PER_SERIES)}{shift_row + 3}:{chr(ord('C') + shift_col + SHOTS_PER_SERIES)}{3 + shift_row + len(shot_data) - 1})"
+    formula_sum_all = f"=SUM({col_total}{shift_row + 3}:{col_total}{3 + shift_row + len(shot_data) - 1})"
     set_cell(ws, shift_row + 3 + len(shot_data), shift_col + 3 + SHOTS_PER_SERIES, formula_sum_all, b_left=True, b_right=True, b_top=True, b_bottom=True)
 
     for i in range(SHOTS_PER_SERIES):
@@ -424,12 +525,12 @@ def fill_wireframe(ws, name_: str, shot_data: list[list[Shot]], mode: int, start
     `start_cell` [row, col] is the top left cell of this wireframe, Excel cells are 1-indexed."""
 
     shift_row, shift_col = start_cell[0] - 1, start_cell[1] - 1
-    if shift_col >= 26 - 3 - SHOTS_PER_SERIES: # 3 for wireframe
-        raise ValueError("shift_col must be less than 26, otherwise the column names will not fit in Excel")
 
     # name, top left outside
     set_cell(ws, shift_row + 2, shift_col + 1, name_, b_left=True, b_right=True, b_top=True, b_bottom=True, center_h=True)
 
+    use_trunc = (mode == 2) # loop-invariant, decide once instead of per cell
+
     # fill data row by row
     for row, series in enumerate(shot_data):
         # name, left outside
@@ -437,11 +538,9 @@ def fill_wireframe(ws, name_: str, shot_data: list[list[Shot]], mode: int, start
 
         # fill data cell by cell
         for col, shot in enumerate(series):
-            value = trunc(shot.ring) if mode == 2 else shot.ring
-            if shot.ring > 0 and shot.div is None: # manually corrected
-                fill = PATTERN_MARK1
-            elif shot.ring == 0 and shot.div is None: # missed shot
-                fill = PATTERN_MARK2
+            value = trunc(shot.ring) if use_trunc else shot.ring
+            if shot.div is None: # div missing => manually corrected (ring > 0) or missed shot (ring == 0)
+                fill = PATTERN_MARK1 if shot.ring > 0 else PATTERN_MARK2
             else: # normal shot
                 fill = None
             set_cell(ws, shift_row + 3 + row, shift_col + 3 + col, value, fill, center_h=True)
@@ -462,15 +561,12 @@ def save_data(memory: MemoryHandler, mode: int, start_cell: tuple[int]=(1, 1)) -
 
     # save to file, sorted by year and month
 
-    dir_year = datetime.now().strftime("%Y")
-    if not os.path.exists(dir_year):
-        os.mkdir(dir_year)
-
-    dir_month = os.path.join(dir_year, datetime.now().strftime("%m"))
-    if not os.path.exists(dir_month):
-        os.mkdir(dir_month)
+    now = datetime.now() # read the clock once so folder names and filename are guaranteed consistent
+    dir_year = now.strftime("%Y")
+    dir_month = os.path.join(dir_year, now.strftime("%m"))
+    os.makedirs(dir_month, exist_ok=True) # creates the year directory along the way
 
-    fname = os.path.join(dir_month, f"output_{nowtime()}.xlsx")
+    fname = os.path.join(dir_month, f"output_{now.strftime('%Y_%m_%d-%H_%M_%S')}.xlsx")
     wb.save(fname)
     return str(fname)
 
@@ -506,10 +602,15 @@ def main() -> None:
     # setup serial connection and memory handler
     ser = Serial(port=PORT, baudrate=9600, timeout=1, parity=PARITY_NONE, stopbits=STOPBITS_ONE, bytesize=EIGHTBITS, xonxoff=False, rtscts=False)
     mem = MemoryHandler(SHOTS_PER_STRIP)
+    recorder = KeypressRecorder()
 
     key_n = keyboard.KeyCode.from_char("n")
     key_N = keyboard.KeyCode.from_char("N")
 
+    # these instruction lines never change, build them once instead of per loop iteration
+    msg_keys = (f"    - Drücke {Back.WHITE + Fore.BLACK}<n>{Style.RESET_ALL}, um einen neuen Schützen zu erfassen\n"
+                f"    - Drücke {Back.WHITE + Fore.BLACK}<Esc>{Style.RESET_ALL}, um die Ergebnisse zu speichern und das Programm zu beenden\n")
+
     ser.write(CODE_NOBAR)
     print("Gerät gefunden -> start")
     sleep(1) # wait so user can read output
@@ -524,47 +625,55 @@ def main() -> None:
         print(f"Name des {mem.person_count+1}. Schützen eintippen:\n> {Fore.LIGHTCYAN_EX}{name_}{Style.RESET_ALL}\n\nStreifen können nun eingelegt werden\n\n")
         mem.update_person(name_)
 
-        FLAG_next_user = False # flag to jump out of inner while loop to next user
-        while not FLAG_next_user: # one iteration per com cycle, one STX per strip
-
-            # start communication cycle
-            ser.write(CODE_ENQ) # on ENQ, device always sends NAK or STX, normally never empty
-            response = ser.read(1)
-
-            # empty => error
-            if response == b"":
-                print(f"Keine Antwort vom Gerät erhalten, mögliche Ursachen:\n  - Gerät ist nicht eingeschaltet\n  - Gerät ist nicht angeschlossen\n  - Anschluss {PORT} ist nicht richtig")
-                input("Drücke Enter zum Beenden...")
-                raise SystemExit(30)
-
-            # NAK => no new data, check keypresses for exit or next person
-            if response == CODE_NAK:
-                keys_pressed = record_keypresses(0.5) # detect exit-keypress during 0.5s delay between ENQs, as recommended by manual p. 31
-                if keyboard.Key.esc in keys_pressed and (key_n in keys_pressed or key_N in keys_pressed): # ignore when both pressed
-                    continue
-                elif key_n in keys_pressed or key_N in keys_pressed: # enter => new person
-                    FLAG_next_user = True # jump out of inner while loop
-                    continue
-                elif keyboard.Key.esc in keys_pressed: # save data and exit
-                    FLAG_next_user = True # jump out of inner while loop
-                    FLAG_save_exit = True # jump out of outer while loop
-                    continue
-                else:
-                    continue
-
-            # STX => new data being transmitted, start receiving
-            if response == CODE_STX: # transmission start
-                trans = Transmission.from_serial(ser)
-                if trans is None:
-                    print("Fehler: Übertragung fehlerhaft, bitte Kabel auf Wackelkontakt o.ä. prüfen. Dann bestätigen und letzte Scheibe neu erfassen")
-                    input("Drücke Enter zum Bestätigen...")
-                    continue # ACK is already sent by Transmission.from_serial()
-                mem.update_memory(trans)
-                ser.write(CODE_ACK) # com cycle finished
-
-            print(f"Person {mem.person_count} ({Fore.LIGHTYELLOW_EX}{mem.current_person}{Style.RESET_ALL}), Streifen {Fore.LIGHTRED_EX}{mem.strip_count}{Style.RESET_ALL} verarbeitet. {Style.BRIGHT}Weiteren einlegen{Style.RESET_ALL} oder per Tastendruck fortfahren:")
-            print(f"    - Drücke {Back.WHITE + Fore.BLACK}<n>{Style.RESET_ALL}, um einen neuen Schützen zu erfassen")
-            print(f"    - Drücke {Back.WHITE + Fore.BLACK}<Esc>{Style.RESET_ALL}, um die Ergebnisse zu speichern und das Programm zu beenden\n")
+        recorder.start() # only record while polling the device, beaupy needs the keyboard for the name prompt above
+
+        try: # make sure the suppressing listener is released even if an error escapes the loop, otherwise later input() prompts never see the keyboard
+            FLAG_next_user = False # flag to jump out of inner while loop to next user
+            while not FLAG_next_user: # one iteration per com cycle, one STX per strip
+
+                # start communication cycle
+                ser.write(CODE_ENQ) # on ENQ, device always sends NAK or STX, normally never empty
+                response = ser.read(1)
+
+                # empty => error
+                if response == b"":
+                    recorder.stop() # release the keyboard, input() below needs it
+                    print(f"Keine Antwort vom Gerät erhalten, mögliche Ursachen:\n  - Gerät ist nicht eingeschaltet\n  - Gerät ist nicht angeschlossen\n  - Anschluss {PORT} ist nicht richtig")
+                    input("Drücke Enter zum Beenden...")
+                    raise SystemExit(30)
+
+                # NAK => no new data, check keypresses for exit or next person
+                if response == CODE_NAK:
+                    keys_pressed = recorder.wait(0.5) # 0.5s delay between ENQs as recommended by manual p. 31, cut short once a key arrives
+                    if keyboard.Key.esc in keys_pressed and (key_n in keys_pressed or key_N in keys_pressed): # ignore when both pressed
+                        continue
+                    elif key_n in keys_pressed or key_N in keys_pressed: # enter => new person
+                        FLAG_next_user = True # jump out of inner while loop
+                        continue
+                    elif keyboard.Key.esc in keys_pressed: # save data and exit
+                        FLAG_next_user = True # jump out of inner while loop
+                        FLAG_save_exit = True # jump out of outer while loop
+                        continue
+                    else:
+                        continue
+
+                # STX => new data being transmitted, start receiving
+                if response == CODE_STX: # transmission start
+                    trans = Transmission.from_serial(ser)
+                    if trans is None:
+                        recorder.stop() # release the keyboard, input() below needs it
+                        print("Fehler: Übertragung fehlerhaft, bitte Kabel auf Wackelkontakt o.ä. prüfen. Dann bestätigen und letzte Scheibe neu erfassen")
+                        input("Drücke Enter zum Bestätigen...")
+                        recorder.start() # back to polling, record keypresses again
+                        continue # ACK is already sent by Transmission.from_serial()
+                    mem.update_memory(trans)
+                    ser.write(CODE_ACK) # com cycle finished
+
+                print(f"Person {mem.person_count} ({Fore.LIGHTYELLOW_EX}{mem.current_person}{Style.RESET_ALL}), Streifen {Fore.LIGHTRED_EX}{mem.strip_count}{Style.RESET_ALL} verarbeitet. {Style.BRIGHT}Weiteren einlegen{Style.RESET_ALL} oder per Tastendruck fortfahren:")
+                print(msg_keys)
+
+        finally:
+            recorder.stop() # release the keyboard before the next name prompt (stop is a no-op if already stopped)
 
     ser.write(CODE_EXIT) # set device inactive
     ser.close()